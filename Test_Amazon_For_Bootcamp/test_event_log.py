@@ -0,0 +1,127 @@
+# Required imports
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from main import EventLog
+
+
+# Stand-in for a WebDriver, the event log only needs its session id
+class FakeDriver:
+    def __init__(self, session_id):
+        self.session_id = session_id
+
+
+# Event Log test class
+class EventLogTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.path = os.path.join(self.tmp_dir.name, "session.jsonl")
+
+    def read_events(self, path=None):
+        with open(path or self.path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def count_lines(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return sum(1 for _ in f)
+        except OSError:
+            return 0
+
+    def test_level_filtering(self):
+        log = EventLog(self.path, level=EventLog.WARNING)
+        self.assertFalse(log.enabled(EventLog.INFO))
+        self.assertTrue(log.enabled(EventLog.ERROR))
+        log.debug("selector_try", selector="//a")
+        log.info("page_loaded")
+        log.warning("retry", attempt=2)
+        log.error("failed")
+        log.close()
+
+        self.assertEqual([(event["level"], event["event"]) for event in self.read_events()],
+                         [("WARNING", "retry"), ("ERROR", "failed")])
+
+    def test_close_flushes_buffer(self):
+        # Neither a full batch nor the flush interval is reached, so only close() writes the events
+        log = EventLog(self.path, level=EventLog.DEBUG, buffer_size=1000, flush_interval=60)
+        for index in range(5):
+            log.debug("selector_try", index=index)
+        self.assertFalse(os.path.exists(self.path))
+        log.close()
+
+        self.assertEqual([event["index"] for event in self.read_events()], [0, 1, 2, 3, 4])
+
+    def test_full_batch_is_written(self):
+        log = EventLog(self.path, level=EventLog.DEBUG, buffer_size=3, flush_interval=60)
+        for index in range(3):
+            log.debug("selector_try", index=index)
+        # The full batch is written without waiting for close()
+        deadline = time.time() + 5
+        while self.count_lines() < 3 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(len(self.read_events()), 3)
+        log.close()
+
+    def test_json_lines_output(self):
+        log = EventLog(self.path, level=EventLog.INFO)
+        log.info("click_failed", error=ValueError("boom"), count=2)
+        log.close()
+
+        event = self.read_events()[0]
+        self.assertEqual(event["error"], "boom")
+        self.assertEqual(event["count"], 2)
+        self.assertEqual(event["level"], "INFO")
+        self.assertEqual(event["event"], "click_failed")
+        self.assertIsInstance(event["ts"], float)
+
+    def test_off_level_has_no_writer(self):
+        log = EventLog(None, EventLog.OFF)
+        log.error("ignored")
+        self.assertIsNone(log.writer)
+        log.close()
+
+    def test_for_session_off_level(self):
+        with mock.patch.dict(os.environ, {"EVENT_LOG_DIR": self.tmp_dir.name, "EVENT_LOG_LEVEL": "off"}):
+            log = EventLog.for_session(FakeDriver("session-off"))
+        self.addCleanup(log.close)
+        self.assertEqual(log.level, EventLog.OFF)
+        self.assertIsNone(log.writer)
+
+    def test_for_session_unknown_level_warns_once(self):
+        with mock.patch.dict(os.environ, {"EVENT_LOG_DIR": self.tmp_dir.name, "EVENT_LOG_LEVEL": "verbose"}), \
+                mock.patch("builtins.print") as printed:
+            first = EventLog.for_session(FakeDriver("session-c"))
+            second = EventLog.for_session(FakeDriver("session-d"))
+        self.addCleanup(first.close)
+        self.addCleanup(second.close)
+        self.assertEqual(first.level, EventLog.INFO)
+        self.assertEqual(second.level, EventLog.INFO)
+        printed.assert_called_once()
+        self.assertIn("VERBOSE", printed.call_args.args[0])
+
+    def test_for_session_shares_log(self):
+        with mock.patch.dict(os.environ, {"EVENT_LOG_DIR": self.tmp_dir.name, "EVENT_LOG_LEVEL": "debug"}):
+            first = EventLog.for_session(FakeDriver("session-a"))
+            second = EventLog.for_session(FakeDriver("session-a"))
+            other = EventLog.for_session(FakeDriver("session-b"))
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertEqual(first.level, EventLog.DEBUG)
+        self.assertEqual(first.path, os.path.join(self.tmp_dir.name, "session-a.jsonl"))
+
+        first.debug("from_first")
+        second.debug("from_second")
+        first.close()
+        other.close()
+        # A closed log is dropped, so the session gets a fresh one next time
+        self.assertNotIn("session-a", EventLog.sessions)
+        self.assertEqual([event["event"] for event in self.read_events(first.path)], ["from_first", "from_second"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+# Required imports
+import json
+import os
+import tempfile
+import unittest
+
+from main import GridScheduler
+
+# Canned Grid 4 /status payload: two free slots on node-1, one busy and one free on node-2, node-3 draining
+GRID_STATUS = {
+    "value": {
+        "ready": True,
+        "nodes": [
+            {
+                "uri": "http://10.0.0.1:5555",
+                "availability": "UP",
+                "slots": [
+                    {"session": None, "stereotype": {"browserName": "chrome", "amazon:node": "node-1"}},
+                    {"session": None, "stereotype": {"browserName": "chrome", "amazon:node": "node-1"}},
+                ],
+            },
+            {
+                "uri": "http://10.0.0.2:5555",
+                "availability": "UP",
+                "slots": [
+                    {"session": {"sessionId": "abc"}, "stereotype": {"browserName": "chrome"}},
+                    {"session": None, "stereotype": {"browserName": "chrome"}},
+                ],
+            },
+            {
+                "uri": "http://10.0.0.3:5555",
+                "availability": "DRAINING",
+                "slots": [{"session": None, "stereotype": {"browserName": "chrome"}}],
+            },
+        ],
+    }
+}
+
+# Node the stub flows report their session ran on
+REPORTED_NODE = "http://10.0.0.9:5555"
+
+
+# Stand-in for an AmazonTest flow: the scheduler only needs id() and run(result)
+class StubFlow:
+    def __init__(self, flow_id="flows.amazon", repeat=0):
+        self.flow_id = flow_id
+        self.repeat = repeat
+
+    def id(self):
+        return self.flow_id
+
+    def run(self, result):
+        self.node_uri = REPORTED_NODE
+        self.step_results = {"navigate_home": {"outcome": "passed", "attempts": 1, "duration": 1.0}}
+
+
+# Grid Scheduler test class
+class GridSchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.report_path = os.path.join(self.tmp_dir.name, "grid_report.json")
+        self.scheduler = GridScheduler("http://localhost:4444/",
+                                       history_path=os.path.join(self.tmp_dir.name, "step_history.json"),
+                                       report_path=self.report_path)
+        self.scheduler.request = lambda path, payload=None: GRID_STATUS
+
+    def write_durations(self, durations):
+        with open(self.report_path, "w", encoding="utf-8") as f:
+            json.dump({"flows": [], "durations": durations}, f)
+
+    def read_report(self):
+        with open(self.report_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def test_node_capacity(self):
+        self.assertEqual(self.scheduler.node_capacity(), {
+            "http://10.0.0.1:5555": {"slots": 2, "label": "node-1"},
+            "http://10.0.0.2:5555": {"slots": 1, "label": None},
+        })
+
+    def test_estimate_shared_by_repeats(self):
+        self.write_durations({"flows.amazon": [100, 200]})
+        self.assertEqual(self.scheduler.estimate(StubFlow(repeat=0)), 150)
+        self.assertEqual(self.scheduler.estimate(StubFlow(repeat=3)), 150)
+
+    def test_plan_orders_longest_first(self):
+        self.write_durations({"flows.short": [10], "flows.long": [300, 200], "flows.medium": [60]})
+        flows = [StubFlow("flows.short"), StubFlow("flows.long"), StubFlow("flows.medium")]
+        plan = self.scheduler.plan(flows, self.scheduler.node_capacity())
+        self.assertEqual([flow.id() for flow, _, _ in plan], ["flows.long", "flows.medium", "flows.short"])
+        self.assertEqual([estimate for _, _, estimate in plan], [250, 60, 10])
+
+    def test_plan_balances_by_slots(self):
+        flows = [StubFlow(repeat=index) for index in range(6)]
+        plan = self.scheduler.plan(flows, self.scheduler.node_capacity())
+        nodes = [node for _, node, _ in plan]
+        self.assertEqual(nodes.count("http://10.0.0.1:5555"), 4)
+        self.assertEqual(nodes.count("http://10.0.0.2:5555"), 2)
+
+    def test_run_pins_flows_and_writes_report(self):
+        flows = [StubFlow(repeat=index) for index in range(3)]
+        self.assertTrue(self.scheduler.run(flows))
+
+        # Flows planned on the labelled node carry its label; the unlabelled node cannot be pinned
+        report = self.read_report()
+        planned = {entry["repeat"]: entry["planned_node"] for entry in report["flows"]}
+        for flow in flows:
+            expected_label = "node-1" if planned[flow.repeat] == "http://10.0.0.1:5555" else None
+            self.assertEqual(flow.node_label, expected_label)
+
+        self.assertEqual(report["grid"], "http://localhost:4444")
+        self.assertEqual(sorted(entry["repeat"] for entry in report["flows"]), [0, 1, 2])
+        for entry in report["flows"]:
+            self.assertEqual(set(entry), {"flow", "repeat", "status", "duration", "planned_node", "node",
+                                          "steps", "events", "artifacts", "errors"})
+            self.assertEqual(entry["status"], "passed")
+            self.assertEqual(entry["node"], REPORTED_NODE)
+            self.assertEqual(entry["steps"]["navigate_home"]["outcome"], "passed")
+
+    def test_run_keeps_bounded_duration_history(self):
+        window = GridScheduler.DURATION_WINDOW
+        self.write_durations({"flows.amazon": [500] * window, "flows.other": [42]})
+        self.scheduler.run([StubFlow(repeat=0), StubFlow(repeat=1)])
+
+        durations = self.read_report()["durations"]
+        self.assertEqual(len(durations["flows.amazon"]), window)
+        self.assertEqual(durations["flows.amazon"][:window - 2], [500] * (window - 2))
+        self.assertLess(max(durations["flows.amazon"][-2:]), 500)
+        self.assertEqual(durations["flows.other"], [42])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+# Required imports
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from selenium.common.exceptions import WebDriverException
+
+from main import EventLog, RetryPolicy, StepRunner
+
+
+# Stand-in for a WebDriver that records the recovery calls made on it
+class FakeDriver:
+    def __init__(self):
+        self.session_id = None
+        self.current_url = "https://example.test/start"
+        self.calls = []
+
+    def refresh(self):
+        self.calls.append(("refresh",))
+
+    def get(self, url):
+        self.calls.append(("get", url))
+
+
+# Action returning the given results one call at a time
+def results_of(*results):
+    results = list(results)
+
+    def action():
+        result = results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    return action
+
+
+# Retry Policy test class
+class RetryPolicyTest(unittest.TestCase):
+    def test_delay_backoff(self):
+        policy = RetryPolicy(attempts=4, backoff=2, backoff_factor=3)
+        self.assertEqual([policy.delay(retry) for retry in (1, 2, 3)], [2, 6, 18])
+
+    def test_at_least_one_attempt(self):
+        self.assertEqual(RetryPolicy(attempts=0).attempts, 1)
+
+
+# Step Runner test class
+class StepRunnerTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.history_path = os.path.join(self.tmp_dir.name, "step_history.json")
+        self.driver = FakeDriver()
+        self.runner = StepRunner(self.driver, self.history_path)
+        # Keep step events out of the working directory
+        self.runner.events.close()
+        self.runner.events = EventLog(None, EventLog.OFF)
+        # Retries should not actually wait
+        sleep = mock.patch("main.time.sleep")
+        self.sleep = sleep.start()
+        self.addCleanup(sleep.stop)
+
+    def run_step(self, action, **policy):
+        return self.runner.run_step("step", action, policy=RetryPolicy(**policy))
+
+    def test_passed_first_attempt(self):
+        self.assertTrue(self.run_step(results_of(True), attempts=3))
+        self.assertEqual(self.runner.results["step"]["outcome"], StepRunner.PASSED)
+        self.assertEqual(self.runner.results["step"]["attempts"], 1)
+        self.sleep.assert_not_called()
+
+    def test_recovered_after_retries(self):
+        action = results_of(False, WebDriverException("stale"), True)
+        self.assertTrue(self.run_step(action, attempts=3, backoff=1, backoff_factor=2))
+        self.assertEqual(self.runner.results["step"]["outcome"], StepRunner.RECOVERED)
+        self.assertEqual(self.runner.results["step"]["attempts"], 3)
+        self.assertEqual([call.args[0] for call in self.sleep.call_args_list], [1, 2])
+
+    def test_failed_after_all_attempts(self):
+        self.assertFalse(self.run_step(results_of(False, False), attempts=2))
+        self.assertEqual(self.runner.results["step"]["outcome"], StepRunner.FAILED)
+        self.assertEqual(self.runner.results["step"]["attempts"], 2)
+
+    def test_unexpected_exception_is_recorded(self):
+        with self.assertRaises(ValueError):
+            self.run_step(results_of(False, ValueError("boom")), attempts=3)
+        self.assertEqual(self.runner.results["step"]["outcome"], StepRunner.FAILED)
+        self.assertEqual(self.runner.results["step"]["attempts"], 2)
+        self.assertIn("duration", self.runner.results["step"])
+
+    def test_refresh_recovery(self):
+        self.run_step(results_of(False, True), attempts=2, recovery=RetryPolicy.RECOVERY_REFRESH)
+        self.assertEqual(self.driver.calls, [("refresh",)])
+
+    def test_renavigate_recovery(self):
+        self.run_step(results_of(False, True), attempts=2, recovery=RetryPolicy.RECOVERY_RENAVIGATE,
+                      url="https://example.test/home")
+        self.assertEqual(self.driver.calls, [("get", "https://example.test/home")])
+
+    def test_checkpoint_recovery(self):
+        # The first successful step sets the checkpoint used by the next step's recovery
+        self.assertIsNone(self.runner.checkpoint_url)
+        self.run_step(results_of(True))
+        self.driver.current_url = "https://example.test/elsewhere"
+        self.run_step(results_of(False, True), attempts=2, recovery=RetryPolicy.RECOVERY_CHECKPOINT)
+        self.assertEqual(self.driver.calls, [("get", "https://example.test/start")])
+
+    def test_checkpoint_recovery_without_checkpoint(self):
+        self.run_step(results_of(False, True), attempts=2, recovery=RetryPolicy.RECOVERY_CHECKPOINT)
+        self.assertEqual(self.driver.calls, [])
+
+    def test_save_history_merges_and_trims(self):
+        with open(self.history_path, "w", encoding="utf-8") as f:
+            json.dump({"step": [{"outcome": StepRunner.PASSED, "attempts": 1, "duration": 1}]
+                       * StepRunner.HISTORY_WINDOW,
+                       "other": [{"outcome": StepRunner.FAILED, "attempts": 1, "duration": 1}]}, f)
+
+        self.run_step(results_of(False, True), attempts=2)
+        saved = self.runner.save_history()
+        self.assertEqual(saved["step"]["outcome"], StepRunner.RECOVERED)
+        self.assertEqual(self.runner.results, {})
+
+        with open(self.history_path, encoding="utf-8") as f:
+            history = json.load(f)
+        self.assertEqual(len(history["step"]), StepRunner.HISTORY_WINDOW)
+        self.assertEqual(history["step"][-1]["outcome"], StepRunner.RECOVERED)
+        self.assertEqual(len(history["other"]), 1)
+
+    def classify(self, *outcomes):
+        self.runner.history = {"step": [{"outcome": outcome} for outcome in outcomes]}
+        return self.runner.classify("step")
+
+    def test_classify(self):
+        passed, recovered, failed = StepRunner.PASSED, StepRunner.RECOVERED, StepRunner.FAILED
+        self.assertEqual(self.runner.classify("missing"), "unknown")
+        self.assertEqual(self.classify(passed, passed), "stable")
+        self.assertEqual(self.classify(passed, recovered, passed), "flaky")
+        self.assertEqual(self.classify(passed, failed, passed), "flaky")
+        self.assertEqual(self.classify(failed), "failing")
+        # A stable step that breaks for good is failing as soon as the streak is long enough
+        self.assertEqual(self.classify(*[passed] * 7, failed, failed), "flaky")
+        self.assertEqual(self.classify(*[passed] * 7, failed, failed, failed), "failing")
+
+
+if __name__ == "__main__":
+    unittest.main()